@@ -4,6 +4,8 @@ Aplicación Web Flask para Compresor de Audio WAV a MP3 usando Huffman
 """
 
 import os
+import gzip
+import zlib
 from flask import Flask, render_template, request, send_file, flash, redirect, url_for, jsonify
 from werkzeug.utils import secure_filename
 from huffman import HuffmanMP3Compressor
@@ -16,6 +18,10 @@ UPLOAD_FOLDER = 'uploads'
 COMPRESSED_FOLDER = 'compressed'
 ALLOWED_EXTENSIONS = {'wav'}
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB máximo
+TRANSFER_ENCODINGS = {'identity', 'gzip'}  # Formatos de transferencia aceptados
+CHUNK_SIZE = 1024 * 1024  # Tamaño de bloque para descomprimir en streaming
+# Errores atribuibles al contenido enviado por el cliente (no a fallos del servidor)
+UPLOAD_DECODE_ERRORS = (gzip.BadGzipFile, EOFError, zlib.error, ValueError)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['COMPRESSED_FOLDER'] = COMPRESSED_FOLDER
@@ -32,6 +38,47 @@ def allowed_file(filename):
         filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+class UploadTooLargeError(ValueError):
+    """El archivo guardado supera el número de bytes permitido"""
+
+
+def save_upload(file, path, encoding='identity', limit=MAX_FILE_SIZE):
+    """
+    Guarda el archivo subido, descomprimiéndolo en streaming si el cliente lo envió con gzip.
+    Devuelve los bytes escritos en disco; si superan `limit` lanza UploadTooLargeError.
+    """
+    if encoding not in TRANSFER_ENCODINGS:
+        raise ValueError(f'Formato de transferencia no soportado: {encoding}')
+
+    too_large = UploadTooLargeError(
+        f'El archivo descomprimido supera el máximo permitido ({limit // (1024 * 1024)}MB)'
+    )
+    written = 0
+    try:
+        if encoding == 'identity':
+            file.save(path)
+            written = os.path.getsize(path)
+            if written > limit:
+                raise too_large
+            return written
+
+        with gzip.GzipFile(fileobj=file.stream, mode='rb') as source, open(path, 'wb') as target:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                # MAX_CONTENT_LENGTH solo cuenta bytes comprimidos: limitar también lo descomprimido
+                if written > limit:
+                    raise too_large
+                target.write(chunk)
+        return written
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
 @app.route('/')
 def index():
     """Página principal"""
@@ -57,6 +104,7 @@ def upload_file():
         # Obtener parámetros de compresión
         bitrate = request.form.get('bitrate', '128k')
         quality = request.form.get('quality', 'medium')
+        encoding = request.form.get('encoding', 'identity')
 
         # Generar nombres únicos para los archivos
         unique_id = str(uuid.uuid4())
@@ -68,8 +116,11 @@ def upload_file():
         input_path = os.path.join(app.config['UPLOAD_FOLDER'], input_filename)
         output_path = os.path.join(app.config['COMPRESSED_FOLDER'], output_filename)
 
-        # Guardar archivo subido
-        file.save(input_path)
+        # Guardar archivo subido (descomprimiendo si llegó con gzip)
+        try:
+            save_upload(file, input_path, encoding)
+        except UPLOAD_DECODE_ERRORS as e:
+            return jsonify({'error': f'Error al recibir el archivo: {str(e)}'}), 400
 
         # Comprimir archivo usando Huffman + MP3
         huffman_compressor = HuffmanMP3Compressor()
@@ -141,11 +192,17 @@ def batch_upload_files():
         # Obtener parámetros de compresión
         bitrate = request.form.get('bitrate', '128k')
         quality = request.form.get('quality', 'medium')
+        # El cliente envía un 'encoding' por archivo, en el mismo orden
+        encodings = request.form.getlist('encoding')
 
         results = []
+        output_paths = []
+        # Presupuesto de bytes descomprimidos para todo el lote, igual que
+        # MAX_CONTENT_LENGTH limita el lote completo cuando se sube sin comprimir
+        remaining = MAX_FILE_SIZE
         huffman_compressor = HuffmanMP3Compressor()  # Usar compresor Huffman
 
-        for file in files:
+        for position, file in enumerate(files):
             if file.filename == '' or not allowed_file(file.filename):
                 continue
 
@@ -161,7 +218,8 @@ def batch_upload_files():
                 output_path = os.path.join(app.config['COMPRESSED_FOLDER'], output_filename)
 
                 # Guardar y comprimir con Huffman
-                file.save(input_path)
+                encoding = encodings[position] if position < len(encodings) else 'identity'
+                remaining -= save_upload(file, input_path, encoding, limit=remaining)
                 success = huffman_compressor.compress_wav_to_mp3_with_huffman(
                     input_path,
                     output_path,
@@ -173,6 +231,7 @@ def batch_upload_files():
                     original_size = os.path.getsize(input_path) / (1024 * 1024)
                     compressed_size = os.path.getsize(output_path) / (1024 * 1024)
                     compression_ratio = ((original_size - compressed_size) / original_size) * 100
+                    output_paths.append(output_path)
 
                     results.append({
                         'filename': original_filename,
@@ -194,6 +253,16 @@ def batch_upload_files():
                 if os.path.exists(input_path):
                     os.remove(input_path)
 
+            except UploadTooLargeError:
+                # Rechazar el lote completo y borrar lo ya generado
+                for output_path in output_paths:
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                return jsonify({
+                    'error': f'El lote descomprimido supera el máximo permitido '
+                             f'({MAX_FILE_SIZE // (1024 * 1024)}MB)'
+                }), 400
+
             except Exception as e:
                 results.append({
                     'filename': file.filename,
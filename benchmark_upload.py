@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Mide el coste de la subida comprimida con gzip frente a la subida sin comprimir.
+
+Para cada WAV informa:
+  - bytes enviados (aplicando el mismo umbral que static/js/app.js),
+  - tiempo de compresión en el navegador (CompressionStream de Node si está
+    disponible, que usa zlib igual que el navegador; si no, gzip de Python),
+  - tiempo de recepción en el servidor (parseo multipart de Flask + save_upload)
+    para cada formato de transferencia,
+  - tiempo del pipeline Huffman + MP3, que es el mismo para ambos formatos,
+  - tiempo total estimado para varias velocidades de subida.
+
+Sin argumentos genera señales sintéticas (tonos casi puros y ruido blanco).
+Los tonos son el mejor caso para gzip y no representan grabaciones reales:
+para medir entradas típicas, pasar WAV reales como argumentos.
+"""
+
+import os
+import io
+import sys
+import json
+import gzip
+import math
+import time
+import wave
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from array import array
+
+from flask import request
+
+from app import app, save_upload
+from huffman import HuffmanMP3Compressor
+
+GZIP_UPLOAD_THRESHOLD = 0.80  # Debe coincidir con static/js/app.js
+SAMPLE_RATE = 44100
+
+NODE_GZIP_SCRIPT = """
+const fs = require('fs');
+const data = fs.readFileSync(process.argv[1]);
+const start = performance.now();
+const stream = new Blob([data]).stream().pipeThrough(new CompressionStream('gzip'));
+new Response(stream).arrayBuffer().then(buffer => {
+    const ms = performance.now() - start;
+    fs.writeFileSync(process.argv[2], Buffer.from(buffer));
+    console.log(JSON.stringify({ms: ms}));
+});
+"""
+
+
+def generate_wav(path, kind, seconds):
+    """Genera un WAV estéreo de 16 bits sintético (mejor caso para gzip salvo 'ruido')"""
+    rng = random.Random(0)
+    samples = array('h')
+    for i in range(SAMPLE_RATE * seconds):
+        t = i / SAMPLE_RATE
+        if kind == 'musica':
+            envelope = 0.6 + 0.4 * math.sin(2 * math.pi * 0.5 * t)
+            value = envelope * (0.30 * math.sin(2 * math.pi * 220 * t)
+                                + 0.15 * math.sin(2 * math.pi * 330 * t + 1)
+                                + 0.08 * math.sin(2 * math.pi * 880 * t + 2)) \
+                + 0.02 * rng.gauss(0, 1)
+        elif kind == 'voz':
+            # Frases de 1 s separadas por pausas con ruido de fondo
+            active = int(t) % 2 == 0
+            value = (0.3 * math.sin(2 * math.pi * 180 * t) * math.sin(2 * math.pi * 4 * t) if active else 0) \
+                + 0.002 * rng.gauss(0, 1)
+        else:
+            value = 0.3 * rng.gauss(0, 1)
+        sample = max(-32768, min(32767, int(value * 32767)))
+        samples.append(sample)
+        samples.append(sample)
+
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(samples.tobytes())
+
+
+def browser_gzip(path, gz_path):
+    """Comprime como lo haría el navegador y devuelve (segundos, método)"""
+    if shutil.which('node'):
+        result = subprocess.run(
+            ['node', '-e', NODE_GZIP_SCRIPT, path, gz_path],
+            capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout)['ms'] / 1000, 'CompressionStream (node)'
+
+    with open(path, 'rb') as source:
+        data = source.read()
+    start = time.perf_counter()
+    compressed = gzip.compress(data)
+    elapsed = time.perf_counter() - start
+    with open(gz_path, 'wb') as target:
+        target.write(compressed)
+    return elapsed, 'gzip (python)'
+
+
+def receive_upload(path, body_path, encoding, workdir):
+    """Simula la recepción de /upload y devuelve los segundos empleados"""
+    with open(body_path, 'rb') as body:
+        data = {'file': (io.BytesIO(body.read()), os.path.basename(path)), 'encoding': encoding}
+    input_path = os.path.join(workdir, 'recibido.wav')
+
+    start = time.perf_counter()
+    with app.test_request_context('/upload', method='POST', data=data,
+                                  content_type='multipart/form-data'):
+        save_upload(request.files['file'], input_path, request.form['encoding'])
+    elapsed = time.perf_counter() - start
+
+    os.remove(input_path)
+    return elapsed
+
+
+def pipeline(path, workdir):
+    """Ejecuta el pipeline Huffman + MP3 y devuelve (segundos, éxito)"""
+    output_path = os.path.join(workdir, 'salida.mp3')
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        success = HuffmanMP3Compressor().compress_wav_to_mp3_with_huffman(path, output_path)
+    return time.perf_counter() - start, success
+
+
+def benchmark(path, links, workdir):
+    """Mide una subida sin comprimir y una comprimida del mismo archivo"""
+    raw_bytes = os.path.getsize(path)
+    gz_path = os.path.join(workdir, os.path.basename(path) + '.gz')
+    compress_time, method = browser_gzip(path, gz_path)
+    gz_bytes = os.path.getsize(gz_path)
+
+    # Mismo criterio que el navegador: si no compensa, se envía el original
+    if gz_bytes >= raw_bytes * GZIP_UPLOAD_THRESHOLD:
+        encoding, wire_path, wire_bytes = 'identity', path, raw_bytes
+    else:
+        encoding, wire_path, wire_bytes = 'gzip', gz_path, gz_bytes
+
+    raw_receive = receive_upload(path, path, 'identity', workdir)
+    gz_receive = receive_upload(path, wire_path, encoding, workdir)
+    pipeline_time, success = pipeline(path, workdir)
+
+    print(f"\n{os.path.basename(path)}")
+    print(f"  Tamaño WAV:              {raw_bytes / 1e6:.2f} MB")
+    print(f"  gzip:                    {gz_bytes / 1e6:.2f} MB ({100 * gz_bytes / raw_bytes:.0f}%)")
+    print(f"  Se envía como:           {encoding}, {wire_bytes / 1e6:.2f} MB")
+    print(f"  Compresión navegador:    {compress_time * 1000:.0f} ms [{method}]")
+    print(f"  Recepción sin comprimir: {raw_receive * 1000:.0f} ms")
+    print(f"  Recepción comprimida:    {gz_receive * 1000:.0f} ms")
+    print(f"  Pipeline Huffman + MP3:  {pipeline_time * 1000:.0f} ms"
+          f"{'' if success else ' (falló, ver aviso de ffmpeg)'}")
+
+    # Aunque se envíe como identity, el navegador ya pagó el tiempo de compresión
+    for mbps in links:
+        raw_total = raw_bytes * 8 / (mbps * 1e6) + raw_receive + pipeline_time
+        gz_total = compress_time + wire_bytes * 8 / (mbps * 1e6) + gz_receive + pipeline_time
+        print(f"  Total a {mbps:>5g} Mbit/s:    sin comprimir {raw_total:6.2f} s | con el cliente {gz_total:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide bytes enviados y tiempo total de la subida comprimida con gzip"
+    )
+    parser.add_argument("files", nargs="*", help="Archivos WAV reales a medir (por defecto se generan señales sintéticas)")
+    parser.add_argument("-s", "--seconds", type=int, default=30,
+                        help="Duración de los WAV generados")
+    parser.add_argument("-l", "--links", type=float, nargs="+", default=[5, 20, 100, 1000],
+                        help="Velocidades de subida en Mbit/s")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        files = args.files
+        if not files:
+            files = []
+            for kind in ('musica', 'voz', 'ruido'):
+                path = os.path.join(workdir, f"{kind}.wav")
+                generate_wav(path, kind, args.seconds)
+                files.append(path)
+
+        if not shutil.which('ffmpeg'):
+            print("Aviso: ffmpeg no está instalado; el pipeline fallará en el paso MP3 y su "
+                  "tiempo no incluirá la codificación MP3", file=sys.stderr)
+
+        for path in files:
+            benchmark(path, args.links, workdir)
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
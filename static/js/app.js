@@ -123,6 +123,39 @@ function setupDragAndDrop(container, input) {
     });
 }
 
+// Umbral de compresión: si gzip no reduce al menos un 20%, se envía el original.
+// Por debajo de ese ahorro el tiempo de comprimir en el navegador no se recupera
+// ni en enlaces de ~20 Mbit/s (ver benchmark_upload.py)
+const GZIP_UPLOAD_THRESHOLD = 0.80;
+
+// Función para comprimir archivos con gzip antes de subirlos
+// Se añade un campo 'encoding' por archivo, en el mismo orden que los archivos
+function appendCompressedFiles(formData, fieldName, files) {
+    if (typeof CompressionStream === 'undefined') {
+        // Navegador sin soporte: enviar los archivos sin comprimir
+        files.forEach(file => {
+            formData.append(fieldName, file);
+            formData.append('encoding', 'identity');
+        });
+        return Promise.resolve();
+    }
+
+    // Comprimir de uno en uno: solo hay una compresión en curso y los archivos
+    // que no compensan se envían desde el File original sin copiarlos en memoria
+    return files.reduce((previous, file) => previous.then(() => {
+        const stream = file.stream().pipeThrough(new CompressionStream('gzip'));
+        return new Response(stream).blob().then(blob => {
+            if (blob.size >= file.size * GZIP_UPLOAD_THRESHOLD) {
+                formData.append(fieldName, file);
+                formData.append('encoding', 'identity');
+            } else {
+                formData.append(fieldName, blob, file.name);
+                formData.append('encoding', 'gzip');
+            }
+        });
+    }), Promise.resolve());
+}
+
 // Función para mostrar notificaciones toast
 function showToast(message, type = 'success') {
     const toastContainer = document.getElementById('toast-container') || createToastContainer();